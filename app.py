@@ -1,5 +1,7 @@
+import logging
 import os
 from flask import Flask, request, jsonify, send_from_directory
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
 import datetime
 
@@ -45,6 +47,13 @@ You must systematically evaluate each claim against the following pillars of fra
 (Full system prompt continues as provided by user...)
 """ # Truncated for brevity in this display, but the full prompt is included in the file.
 
+# Stable prompt prefix, built once. The system prompt must stay at the head of the
+# combined prompt and the per-request user query at the tail, so that the large
+# shared prefix is identical across requests (this is what Gemini's implicit
+# prefix caching matches on).
+PROMPT_PREFIX = SYSTEM_PROMPT + "\n\n[User Query Start]\n"
+PROMPT_SUFFIX = "\n[User Query End]"
+
 app = Flask(__name__, static_folder='static', static_url_path='')
 # Serve index.html from the root, and static files from /static
 # However, to make CSS and JS work directly from root in index.html,
@@ -53,6 +62,18 @@ app = Flask(__name__, static_folder='static', static_url_path='')
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024 # 16MB max upload size
 
+# Vertex AI endpoint for each model offered in index.html.
+# Resolved once at startup rather than looked up from the environment per request.
+MODEL_ENDPOINTS = {
+    'gemini-2.5-pro': os.getenv('GEMINI_2_5_PRO_ENDPOINT'),
+    'gemini-2.5-flash': os.getenv('GEMINI_2_5_FLASH_ENDPOINT'),
+    'gemma-3': os.getenv('GEMMA_3_ENDPOINT'),
+    'llama-3.3': os.getenv('LLAMA_3_3_ENDPOINT'),
+}
+
+# Files under static/ that index.html requests from the root path
+ROOT_STATIC_FILES = frozenset({'style.css', 'script.js'})
+
 # Ensure the upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
@@ -64,11 +85,17 @@ def index():
 def serve_static(filename):
     # This will serve style.css and script.js from the static folder
     # if they are requested from the root path.
-    if filename in ['style.css', 'script.js']:
+    if filename in ROOT_STATIC_FILES:
         return send_from_directory(app.static_folder, filename)
     return send_from_directory('.', filename)
 
 
+@app.errorhandler(RequestEntityTooLarge)
+def handle_request_too_large(e):
+    # Return JSON so the frontend can show the message instead of an HTML error page
+    limit_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({"error": f"Upload exceeds the {limit_mb}MB size limit"}), 413
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_claim():
     if 'prompt' not in request.form:
@@ -77,46 +104,46 @@ def analyze_claim():
         return jsonify({"error": "Model selection is missing"}), 400
 
     selected_model = request.form['model']
+    if selected_model not in MODEL_ENDPOINTS:
+        return jsonify({"error": f"Unknown model: {selected_model}"}), 400
     user_prompt = request.form['prompt']
-    files = request.files.getlist('files') # Get list of files
+    # Keep only parts that actually carry a file; empty selections have no filename
+    files = [f for f in request.files.getlist('files') if f.filename]
+    # Reject blank submissions before doing any work on them
+    if not user_prompt.strip() and not files:
+        return jsonify({"error": "Prompt is empty"}), 400
 
-    # (Conceptual) Retrieve Vertex AI endpoint based on selected_model from env vars
-    # GEMINI_2_5_PRO_ENDPOINT = os.getenv('GEMINI_2_5_PRO_ENDPOINT')
-    # GEMINI_2_5_FLASH_ENDPOINT = os.getenv('GEMINI_2_5_FLASH_ENDPOINT')
-    # GEMMA_3_ENDPOINT = os.getenv('GEMMA_3_ENDPOINT')
-    # LLAMA_3_3_ENDPOINT = os.getenv('LLAMA_3_3_ENDPOINT')
+    # (Conceptual) Vertex AI endpoint the selected model would be called on
+    endpoint = MODEL_ENDPOINTS[selected_model]
 
     # For now, we'll just log the selection and files
-    print(f"Received request for model: {selected_model}")
-    print(f"User Prompt: {user_prompt}")
+    app.logger.info("Received request for model: %s (endpoint: %s)", selected_model, endpoint or 'not configured')
+    app.logger.debug("User Prompt: %s", user_prompt)
 
     saved_files_info = []
-    if files:
-        for file in files:
-            if file.filename == '':
-                continue # Skip if no file was selected
-            if file: # Check if file is present
-                filename = secure_filename(file.filename)
-                # Add a timestamp to filename to avoid overwrites and make it unique
-                timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
-                unique_filename = f"{timestamp}_{filename}"
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-                try:
-                    file.save(filepath)
-                    saved_files_info.append({"filename": filename, "saved_path": filepath, "size": os.path.getsize(filepath)})
-                    print(f"Saved file: {filepath}")
-                except Exception as e:
-                    print(f"Error saving file {filename}: {e}")
-                    # Potentially return an error to the user or handle gracefully
-
-    # Prepend system prompt to user prompt
-    combined_prompt = SYSTEM_PROMPT + "\n\n[User Query Start]\n" + user_prompt + "\n[User Query End]"
+    for file in files:
+        filename = secure_filename(file.filename)
+        # Add a timestamp to filename to avoid overwrites and make it unique
+        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
+        unique_filename = f"{timestamp}_{filename}"
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
+        try:
+            file.save(filepath)
+            saved_files_info.append({"filename": filename, "saved_path": filepath, "size": os.path.getsize(filepath)})
+            app.logger.debug("Saved file: %s", filepath)
+        except Exception:
+            app.logger.exception("Error saving file %s", filename)
+            # Potentially return an error to the user or handle gracefully
+
+    # Prepend system prompt to user prompt (stable prefix first, user query last)
+    combined_prompt = PROMPT_PREFIX + user_prompt + PROMPT_SUFFIX
 
     # For now, the actual call to Vertex AI is mocked.
     # The 'combined_prompt' and 'saved_files_info' would be sent to the model.
-    print(f"Combined Prompt for AI (first 200 chars): {combined_prompt[:200]}...")
-    if saved_files_info:
-        print(f"Files to be processed by AI: {[f['filename'] for f in saved_files_info]}")
+    # %.200s truncates lazily, so nothing is sliced unless DEBUG is enabled
+    app.logger.debug("Combined Prompt for AI (first 200 chars): %.200s...", combined_prompt)
+    if saved_files_info and app.logger.isEnabledFor(logging.DEBUG):
+        app.logger.debug("Files to be processed by AI: %s", [f['filename'] for f in saved_files_info])
 
     # Mocked response from the "AI Model"
     # This would be replaced by the actual call to the Vertex AI endpoint
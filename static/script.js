@@ -1,3 +1,6 @@
+// Keep in sync with MAX_CONTENT_LENGTH in app.py
+const MAX_UPLOAD_BYTES = 16 * 1024 * 1024;
+
 document.addEventListener('DOMContentLoaded', () => {
     const modelSelect = document.getElementById('model-select');
     const promptInput = document.getElementById('prompt-input');
@@ -28,6 +31,13 @@ document.addEventListener('DOMContentLoaded', () => {
             return;
         }
 
+        // Reject oversized uploads before sending them; the server would only refuse them with a 413
+        const totalBytes = Array.from(files).reduce((sum, file) => sum + file.size, 0);
+        if (totalBytes > MAX_UPLOAD_BYTES) {
+            responseArea.innerHTML = `<p style="color: red;">Selected files total ${(totalBytes / (1024 * 1024)).toFixed(2)} MB, which exceeds the ${MAX_UPLOAD_BYTES / (1024 * 1024)} MB upload limit.</p>`;
+            return;
+        }
+
         submitButton.classList.add('loading');
         submitButton.disabled = true;
         responseArea.innerHTML = '<p>Processing...</p>';
@@ -55,11 +65,7 @@ document.addEventListener('DOMContentLoaded', () => {
             let responseHTML = `<h3>Fraud Confidence Score: ${result.fraudConfidenceScore}</h3>`;
             responseHTML += `<h4>Rationale for Score:</h4>`;
             if (result.rationale && result.rationale.length > 0) {
-                responseHTML += `<ul>`;
-                result.rationale.forEach(point => {
-                    responseHTML += `<li>${point}</li>`;
-                });
-                responseHTML += `</ul>`;
+                responseHTML += `<ul>${result.rationale.map(point => `<li>${point}</li>`).join('')}</ul>`;
             } else {
                 responseHTML += `<p>No rationale provided.</p>`;
             }